@@ -1,5 +1,16 @@
 #!/usr/bin/env python3
+import argparse
+import csv
+import json
+import math
+import os
+import re
+import shutil
+import signal
 import subprocess
+import sys
+import tempfile
+import time
 from collections import defaultdict
 
 
@@ -19,60 +30,113 @@ def parse_elapsed(elapsed_str):
     return 0
 
 
-def get_tmux_panes():
-    """Get all tmux panes"""
-    result = subprocess.run(
-        [
-            "tmux",
-            "list-panes",
-            "-a",
-            "-F",
-            "#{session_name}:#{window_index}.#{pane_index}|#{pane_pid}|#{pane_current_path}|#{pane_active}",
-        ],
-        capture_output=True,
-        text=True,
-        timeout=5,
-    )
+# The path goes last: it is the only field that may itself contain '|'
+TMUX_PANE_FORMAT = (
+    "#{session_name}:#{window_index}.#{pane_index}|#{pane_pid}|#{pane_active}"
+    "|#{pane_id}|#{window_active}|#{session_attached}|#{window_activity}"
+    "|#{window_id}|#{session_id}|#{pane_current_path}"
+)
+
+
+def tmux_command(*args, socket=None):
+    """Build a tmux command line, optionally against a named server (-L)"""
+    return ["tmux", *(["-L", socket] if socket else []), *args]
+
+
+def list_tmux_panes(socket=None):
+    """Raw `tmux list-panes` output for every pane"""
+    try:
+        result = subprocess.run(
+            tmux_command("list-panes", "-a", "-F", TMUX_PANE_FORMAT, socket=socket),
+            capture_output=True,
+            text=True,
+            timeout=5,
+        )
+    except FileNotFoundError:
+        return ""
+    return result.stdout
+
+
+def parse_tmux_panes(output):
+    """Parse `tmux list-panes` output into a pane pid -> pane mapping"""
     panes = {}
-    for line in result.stdout.strip().split("\n"):
+    for line in output.strip().split("\n"):
         if "|" not in line:
             continue
-        parts = line.split("|")
-        if len(parts) >= 4:
+        parts = line.split("|", 9)
+        if len(parts) == 10:
+            (
+                location,
+                pid,
+                active,
+                pane_id,
+                window_active,
+                attached,
+                activity,
+                window_id,
+                session_id,
+                path,
+            ) = parts
             try:
-                panes[int(parts[1])] = {
-                    "location": parts[0],
-                    "path": parts[2],
-                    "active": parts[3] == "1",
+                panes[int(pid)] = {
+                    "location": location,
+                    "path": path,
+                    "active": active == "1",
+                    "mux": "tmux",
+                    "id": pane_id,
+                    "window_id": window_id,
+                    "session_id": session_id,
+                    "focused": (
+                        active == "1"
+                        and window_active == "1"
+                        and attached not in ("", "0")
+                    ),
+                    "activity": int(activity or 0),
                 }
             except ValueError:
                 pass
     return panes
 
 
-def get_process_cwd(pid):
-    """Get working directory"""
+def get_tmux_panes():
+    """Get all tmux panes"""
+    return parse_tmux_panes(list_tmux_panes())
+
+
+def get_process_cwds(pids):
+    """Get working directories for many pids with a single lookup"""
+    cwds = {}
+    if not pids:
+        return cwds
+    if os.path.isdir("/proc/self"):
+        for pid in pids:
+            try:
+                cwds[pid] = os.readlink(f"/proc/{pid}/cwd")
+            except OSError:
+                pass
+        return cwds
     try:
         result = subprocess.run(
-            ["lsof", "-p", str(pid), "-a", "-d", "cwd"],
+            ["lsof", "-a", "-d", "cwd", "-Fn", "-p", ",".join(map(str, pids))],
             capture_output=True,
             text=True,
-            timeout=1,
+            timeout=5,
         )
-        for line in result.stdout.split("\n"):
-            if "cwd" in line:
-                return line.split()[-1]
-    except:
-        pass
-    return None
+    except (OSError, subprocess.TimeoutExpired):
+        return cwds
+    pid = None
+    for line in result.stdout.split("\n"):
+        if line.startswith("p"):
+            pid = int(line[1:])
+        elif line.startswith("n") and pid is not None:
+            cwds[pid] = line[1:]
+    return cwds
 
 
 def shorten_path(path, max_len=40):
     """Shorten path for display"""
     if not path or len(path) <= max_len:
         return path
-    import os
-
     home = os.path.expanduser("~")
     if path.startswith(home):
         path = "~" + path[len(home) :]
@@ -84,82 +148,305 @@ def shorten_path(path, max_len=40):
     return path[: max_len - 3] + "..."
 
 
-def main():
-    print("🔍 Analyzing tmux processes...\n")
-
-    tmux_panes = get_tmux_panes()
-    print(f"Found {len(tmux_panes)} tmux panes")
-
-    # Get all processes
+def run_ps():
+    """Raw ps output for every process"""
     result = subprocess.run(
         ["ps", "-axo", "pid,ppid,rss,etime,command"], capture_output=True, text=True
     )
+    return result.stdout
 
-    processes = []
-    pid_to_ppid = {}
 
-    for line in result.stdout.strip().split("\n")[1:]:
+def parse_ps(output):
+    """Parse ps output into process records"""
+    processes = []
+    for line in output.strip().split("\n")[1:]:
         parts = line.split(None, 4)
         if len(parts) >= 5:
             try:
                 pid, ppid, rss_kb = int(parts[0]), int(parts[1]), int(parts[2])
-                hours = parse_elapsed(parts[3])
-                cmd = parts[4]
-
                 processes.append(
                     {
                         "pid": pid,
                         "ppid": ppid,
                         "rss_mb": rss_kb / 1024.0,
-                        "hours": hours,
-                        "command": cmd,
+                        "hours": parse_elapsed(parts[3]),
+                        "command": parts[4],
                     }
                 )
-                pid_to_ppid[pid] = ppid
             except ValueError:
                 pass
+    return processes
 
-    print(f"Found {len(processes)} total processes\n")
 
-    # Find tmux descendants
-    tmux_pids = [
-        p["pid"] for p in processes if "tmux" in p["command"] and p["rss_mb"] > 10
-    ]
-    descendants = set()
+def get_processes():
+    """Snapshot all processes from ps"""
+    return parse_ps(run_ps())
 
-    def walk(pid):
-        if pid in descendants:
-            return
-        descendants.add(pid)
-        for p in processes:
-            if p["ppid"] == pid:
-                walk(p["pid"])
-
-    for tmux_pid in tmux_pids:
-        walk(tmux_pid)
-
-    # Find pane for each process by walking up parent tree
-    def find_pane(pid):
-        current, depth = pid, 0
-        while current and current != 1 and depth < 15:
-            if current in tmux_panes:
-                return tmux_panes[current]["location"], tmux_panes[current]["active"]
-            current = pid_to_ppid.get(current)
-            depth += 1
-        return None, False
-
-    # Score candidates
-    candidates = []
-    import math
 
+def find_zellij_servers(processes):
+    """Map zellij server pids to the session each one runs"""
+    servers = {}
     for p in processes:
-        if p["pid"] not in descendants or p["pid"] in tmux_pids:
+        args = p["command"].split()
+        if args and os.path.basename(args[0]) == "zellij" and "--server" in args:
+            # The server is started with its socket path, named after the session
+            servers[p["pid"]] = os.path.basename(args[-1])
+    return servers
+
+
+def get_process_environs(pids, names=("ZELLIJ_SESSION_NAME", "ZELLIJ_PANE_ID")):
+    """Read selected environment variables for many pids with a single lookup"""
+    environs = {}
+    if not pids:
+        return environs
+    if os.path.isdir("/proc/self"):
+        for pid in pids:
+            try:
+                with open(f"/proc/{pid}/environ", "rb") as f:
+                    entries = f.read().decode(errors="replace").split("\0")
+            except OSError:
+                continue
+            environs[pid] = dict(
+                entry.split("=", 1)
+                for entry in entries
+                if entry.split("=", 1)[0] in names
+            )
+        return environs
+    try:
+        result = subprocess.run(
+            ["ps", "-wwE", "-o", "pid=,command=", "-p", ",".join(map(str, pids))],
+            capture_output=True,
+            text=True,
+            timeout=5,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return environs
+    for line in result.stdout.splitlines():
+        pid, _, rest = line.strip().partition(" ")
+        environs[int(pid)] = dict(
+            token.split("=", 1)
+            for token in rest.split()
+            if token.split("=", 1)[0] in names
+        )
+    return environs
+
+
+def list_zellij_clients(sessions):
+    """Raw `zellij action list-clients` output per session"""
+    clients = {}
+    if not shutil.which("zellij"):
+        return clients
+    for session in sessions:
+        try:
+            result = subprocess.run(
+                ["zellij", "--session", session, "action", "list-clients"],
+                capture_output=True,
+                text=True,
+                timeout=5,
+            )
+        except (OSError, subprocess.TimeoutExpired):
             continue
-        if p["rss_mb"] < 5 or p["hours"] < 0.08:
+        clients[session] = result.stdout
+    return clients
+
+
+def capture_zellij(processes, with_cwds=True):
+    """Collect what is needed to map zellij panes beyond the ps snapshot.
+
+    Zellij has no equivalent of `tmux list-panes`: pane processes are the
+    server's direct children, and each carries its session and pane id in
+    its environment. Clients report which pane they have focused. Tabs are
+    not exposed per process, so zellij panes sit directly under their session.
+    Cwds are only looked up when they will be shown.
+    """
+    servers = find_zellij_servers(processes)
+    roots = [p["pid"] for p in processes if p["ppid"] in servers]
+    cwds = get_process_cwds(roots) if with_cwds else {}
+    return {
+        "environ": {str(pid): env for pid, env in get_process_environs(roots).items()},
+        "clients": list_zellij_clients(sorted(set(servers.values()))),
+        "cwds": {str(pid): cwd for pid, cwd in cwds.items()},
+    }
+
+
+def parse_zellij_panes(processes, zellij):
+    """Map zellij pane pids to panes, in the same shape as parse_tmux_panes"""
+    servers = find_zellij_servers(processes)
+    focused = {
+        session: set(re.findall(r"terminal_(\d+)", output))
+        for session, output in zellij.get("clients", {}).items()
+    }
+    panes = {}
+    for p in processes:
+        if p["ppid"] not in servers:
             continue
+        env = zellij.get("environ", {}).get(str(p["pid"]), {})
+        session = env.get("ZELLIJ_SESSION_NAME", servers[p["ppid"]])
+        pane_id = env.get("ZELLIJ_PANE_ID", str(p["pid"]))
+        panes[p["pid"]] = {
+            "location": f"zellij:{session}.{pane_id}",
+            "session": session,
+            "path": zellij.get("cwds", {}).get(str(p["pid"]), ""),
+            "active": pane_id in focused.get(session, ()),
+            "mux": "zellij",
+        }
+    return panes
+
+
+SNAPSHOT_FILES = {
+    "tmux": "tmux.txt",
+    "ps": "ps.txt",
+    "cwds": "cwds.json",
+    "zellij": "zellij.json",
+}
+
 
-        pane_loc, is_active = find_pane(p["pid"])
-        cwd = get_process_cwd(p["pid"])
+def capture_snapshot(socket=None, with_cwds=True):
+    """Collect the raw tmux, zellij and ps outputs the advisor works from"""
+    ps = run_ps()
+    return {
+        "tmux": list_tmux_panes(socket),
+        "ps": ps,
+        "cwds": {},
+        "zellij": capture_zellij(parse_ps(ps), with_cwds),
+    }
+
+
+def get_panes(snapshot, processes):
+    """All tmux and zellij panes in a snapshot, keyed by pane pid"""
+    return {
+        **parse_tmux_panes(snapshot["tmux"]),
+        **parse_zellij_panes(processes, snapshot.get("zellij", {})),
+    }
+
+
+def recording_cwd_lookup(snapshot, lookup=get_process_cwds):
+    """Wrap a cwd lookup so every answer is also stored in the snapshot"""
+
+    def record(pids):
+        cwds = lookup(pids)
+        snapshot["cwds"].update(cwds)
+        return cwds
+
+    return record
+
+
+def replay_cwd_lookup(snapshot):
+    """Answer cwd lookups from a recorded snapshot"""
+    cwds = snapshot["cwds"]
+    return lambda pids: {pid: cwds[pid] for pid in pids if pid in cwds}
+
+
+def save_snapshot(directory, snapshot):
+    """Write a snapshot as plain files that can be inspected or hand-edited"""
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, SNAPSHOT_FILES["tmux"]), "w") as f:
+        f.write(snapshot["tmux"])
+    with open(os.path.join(directory, SNAPSHOT_FILES["ps"]), "w") as f:
+        f.write(snapshot["ps"])
+    with open(os.path.join(directory, SNAPSHOT_FILES["cwds"]), "w") as f:
+        json.dump(
+            {str(pid): cwd for pid, cwd in sorted(snapshot["cwds"].items())},
+            f,
+            indent=2,
+        )
+        f.write("\n")
+    with open(os.path.join(directory, SNAPSHOT_FILES["zellij"]), "w") as f:
+        json.dump(snapshot["zellij"], f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def load_snapshot(directory):
+    """Load a snapshot written by save_snapshot"""
+    with open(os.path.join(directory, SNAPSHOT_FILES["tmux"])) as f:
+        tmux = f.read()
+    with open(os.path.join(directory, SNAPSHOT_FILES["ps"])) as f:
+        ps = f.read()
+    try:
+        with open(os.path.join(directory, SNAPSHOT_FILES["cwds"])) as f:
+            cwds = {int(pid): cwd for pid, cwd in json.load(f).items()}
+    except FileNotFoundError:
+        cwds = {}
+    try:
+        with open(os.path.join(directory, SNAPSHOT_FILES["zellij"])) as f:
+            zellij = json.load(f)
+    except FileNotFoundError:
+        zellij = {}
+    return {"tmux": tmux, "ps": ps, "cwds": cwds, "zellij": zellij}
+
+
+def build_tree(processes, panes):
+    """Link processes into a tree and aggregate subtree memory in one pass.
+
+    A top-down walk from the roots attributes every process to its enclosing
+    pane and marks multiplexer descendants; walking that order in reverse then sums
+    each subtree's RSS bottom-up, so pane totals fall out directly.
+    """
+    by_pid = {p["pid"]: p for p in processes}
+    children = defaultdict(list)
+    for p in processes:
+        if p["ppid"] in by_pid and p["ppid"] != p["pid"]:
+            children[p["ppid"]].append(p["pid"])
+    roots = [
+        p["pid"] for p in processes if p["ppid"] not in by_pid or p["ppid"] == p["pid"]
+    ]
+
+    # Multiplexer servers: big tmux processes, plus whatever actually owns a
+    # pane (tmux or zellij)
+    server_pids = {
+        p["pid"] for p in processes if "tmux" in p["command"] and p["rss_mb"] > 10
+    }
+    server_pids |= {by_pid[pid]["ppid"] for pid in panes if pid in by_pid}
+
+    order, pane_of, descendants = [], {}, set()
+    stack = [(pid, None, False) for pid in roots]
+    while stack:
+        pid, pane_pid, in_mux = stack.pop()
+        if pid in panes:
+            pane_pid = pid
+        in_mux = in_mux or pid in server_pids
+        if in_mux:
+            descendants.add(pid)
+        pane_of[pid] = pane_pid
+        order.append(pid)
+        for child in children.get(pid, ()):
+            stack.append((child, pane_pid, in_mux))
+
+    subtree_rss, subtree_count = {}, {}
+    for pid in reversed(order):
+        kids = children.get(pid, ())
+        subtree_rss[pid] = by_pid[pid]["rss_mb"] + sum(subtree_rss[c] for c in kids)
+        subtree_count[pid] = 1 + sum(subtree_count[c] for c in kids)
+
+    return {
+        "by_pid": by_pid,
+        "children": children,
+        "pane_of": pane_of,
+        "descendants": descendants,
+        "server_pids": server_pids,
+        "subtree_rss": subtree_rss,
+        "subtree_count": subtree_count,
+    }
+
+
+def score_candidates(processes, panes, tree, cwd_lookup=get_process_cwds):
+    """Score tmux and zellij descendants by how worthwhile they are to kill"""
+    candidates = []
+    eligible = [
+        p
+        for p in processes
+        if p["pid"] in tree["descendants"]
+        and p["pid"] not in tree["server_pids"]
+        and p["rss_mb"] >= 5
+        and p["hours"] >= 0.08
+    ]
+    cwds = cwd_lookup([p["pid"] for p in eligible]) if cwd_lookup else {}
+
+    for p in eligible:
+        pane_pid = tree["pane_of"].get(p["pid"])
+        pane_loc = panes[pane_pid]["location"] if pane_pid else None
+        is_active = panes[pane_pid]["active"] if pane_pid else False
+        cwd = cwds.get(p["pid"])
 
         # Calculate score
         score = p["rss_mb"] * math.log(p["hours"] + 1)
@@ -191,8 +478,119 @@ def main():
         )
 
     candidates.sort(key=lambda x: x["score"], reverse=True)
+    return candidates
+
+
+def split_location(location):
+    """Split 'session:window.pane' into its session and window keys"""
+    session, _, rest = location.rpartition(":")
+    return session, f"{session}:{rest.split('.')[0]}"
+
+
+def build_rollups(panes, tree, candidates):
+    """Roll pane subtree totals up into windows and sessions.
+
+    Returns session nodes sorted by total memory, each holding its windows,
+    each holding its panes. Zellij sessions hold their panes directly.
+    Every node carries the full subtree RSS, a reclaim estimate (the RSS of
+    kill candidates inside it) and its top offenders by score.
+    """
+    by_location = defaultdict(list)
+    for c in candidates:
+        if c["pane_location"]:
+            by_location[c["pane_location"]].append(c)
+
+    def new_node(name, kind, mux, node_id=None):
+        return {
+            "name": name,
+            "kind": kind,
+            "mux": mux,
+            # tmux ids never get reused, unlike positional names
+            "id": node_id,
+            "rss_mb": 0.0,
+            "reclaim_mb": 0.0,
+            "procs": 0,
+            "active": False,
+            "candidates": [],
+            "children": {},
+        }
 
-    # Display
+    sessions = {}
+    for pane_pid, pane in panes.items():
+        if pane_pid not in tree["subtree_rss"]:
+            continue
+        if pane["mux"] == "zellij":
+            # No tab is known for zellij panes, so they hang off the session
+            session_name = f"zellij:{pane['session']}"
+            session = sessions.setdefault(
+                session_name, new_node(session_name, "session", pane["mux"])
+            )
+            parents = (session,)
+        else:
+            session_name, window_name = split_location(pane["location"])
+            session = sessions.setdefault(
+                session_name,
+                new_node(session_name, "session", pane["mux"], pane["session_id"]),
+            )
+            window = session["children"].setdefault(
+                window_name,
+                new_node(window_name, "window", pane["mux"], pane["window_id"]),
+            )
+            parents = (window, session)
+        leaf = new_node(pane["location"], "pane", pane["mux"], pane.get("id"))
+        leaf["path"] = pane["path"]
+        leaf["candidates"] = by_location.get(pane["location"], [])
+        parents[0]["children"][pane["location"]] = leaf
+        for node in (leaf, *parents):
+            node["rss_mb"] += tree["subtree_rss"][pane_pid]
+            node["procs"] += tree["subtree_count"][pane_pid]
+            node["reclaim_mb"] += sum(c["rss_mb"] for c in leaf["candidates"])
+            node["active"] = node["active"] or pane["active"]
+            if node is not leaf:
+                node["candidates"].extend(leaf["candidates"])
+
+    def finish(nodes):
+        for node in nodes.values():
+            node["candidates"].sort(key=lambda x: x["score"], reverse=True)
+            node["children"] = finish(node["children"])
+        return sorted(nodes.values(), key=lambda x: x["rss_mb"], reverse=True)
+
+    return finish(sessions)
+
+
+def print_rollups(rollups, top=3):
+    """Print the session/window/pane tree with totals and top offenders"""
+    print("\n🌳 Memory by session / window / pane:\n")
+
+    def show(node, prefix, connector, child_prefix):
+        marker = "🟢" if node["active"] and node["kind"] == "pane" else "  "
+        label = shorten_path(node["path"], 30) if node["kind"] == "pane" else ""
+        head = f"{prefix}{connector}{marker} {node['name']}"
+        print(
+            f"{head:<36} {node['rss_mb']:8.1f} MB"
+            f"  (~{node['reclaim_mb']:.1f} MB reclaimable, {node['procs']} procs)  {label}"
+        )
+        rail = "│" if node["children"] else " "
+        for c in node["candidates"][:top]:
+            print(
+                f"{child_prefix}{rail}    ↳ PID {c['pid']:6} - {c['rss_mb']:6.1f}MB - {c['command'][:45]}"
+            )
+        for i, child in enumerate(node["children"]):
+            last = i == len(node["children"]) - 1
+            show(
+                child,
+                child_prefix,
+                "└─" if last else "├─",
+                child_prefix + ("   " if last else "│  "),
+            )
+
+    for session in rollups:
+        show(session, "  ", "", "  ")
+        print()
+
+
+def print_report(candidates, rollups):
+    """Print the candidate table, rollup tree and orphan groups"""
     print("=" * 130)
     print(
         f"{'SCORE':>8} | {'MEM':>7} | {'AGE':>10} | {'LOCATION/PATH':>40} | {'COMMAND'}"
@@ -217,6 +615,9 @@ def main():
     print("=" * 130)
     print(f"\nTop 30 candidates total: {total:.1f} MB ({len(candidates)} total found)")
 
+    if rollups:
+        print_rollups(rollups)
+
     # Group unknowns by directory
     unknown_by_dir = defaultdict(list)
     for c in candidates:
@@ -230,7 +631,7 @@ def main():
             unknown_by_dir[project_dir].append(c)
 
     if unknown_by_dir:
-        print("\n📂 Orphaned processes (no tmux pane):")
+        print("\n📂 Orphaned processes (no tmux or zellij pane):")
         for dir_path, procs in sorted(
             unknown_by_dir.items(),
             key=lambda x: sum(p["rss_mb"] for p in x[1]),
@@ -253,7 +654,882 @@ def main():
     print("\n💡 Tips:")
     print("  🟢 = active pane  |  📂 = orphaned (no pane, showing directory)")
     print("  Navigate: tmux switch-client -t <location>")
-    print("  Kill: kill <pid>")
+    print("            zellij attach <name>  (for zellij:<name>.<pane>)")
+    print("  Kill: kill <pid>  |  Reclaim interactively: --interactive")
+
+
+def candidate_record(c):
+    """Flatten a candidate into a JSON/CSV friendly record"""
+    return {
+        "pid": c["pid"],
+        "rss_mb": round(c["rss_mb"], 2),
+        "hours": round(c["hours"], 3),
+        "score": round(c["score"], 2),
+        "location": c["pane_location"],
+        "cwd": c["cwd"],
+        "active": c["active"],
+        "command": c["command"],
+    }
+
+
+def rollup_record(node):
+    """Convert a rollup node to a record, referencing candidates by pid"""
+    record = {
+        "kind": node["kind"],
+        "mux": node["mux"],
+        "name": node["name"],
+        "rss_mb": round(node["rss_mb"], 2),
+        "reclaim_mb": round(node["reclaim_mb"], 2),
+        "procs": node["procs"],
+        "active": node["active"],
+        "candidates": [c["pid"] for c in node["candidates"]],
+        "children": [rollup_record(child) for child in node["children"]],
+    }
+    if "path" in node:
+        record["path"] = node["path"]
+    return record
+
+
+def iter_rollups(nodes):
+    """Yield every rollup node, parents before children"""
+    for node in nodes:
+        yield node
+        yield from iter_rollups(node["children"])
+
+
+def write_json(candidates, rollups, out=sys.stdout):
+    """Write candidates and the nested rollup tree as one JSON document"""
+    json.dump(
+        {
+            "candidates": [candidate_record(c) for c in candidates],
+            "rollups": [rollup_record(node) for node in rollups],
+        },
+        out,
+        indent=2,
+    )
+    out.write("\n")
+
+
+CSV_FIELDS = [
+    "record",
+    "mux",
+    "name",
+    "pid",
+    "rss_mb",
+    "reclaim_mb",
+    "procs",
+    "hours",
+    "score",
+    "location",
+    "cwd",
+    "active",
+    "command",
+]
+
+
+def write_csv(candidates, rollups, out=sys.stdout):
+    """Write candidates and rollup nodes as one table, tagged by record type"""
+    writer = csv.DictWriter(out, fieldnames=CSV_FIELDS, extrasaction="ignore")
+    writer.writeheader()
+    for c in candidates:
+        writer.writerow({"record": "candidate", **candidate_record(c)})
+    for node in iter_rollups(rollups):
+        record = rollup_record(node)
+        record["record"] = record.pop("kind")
+        # Only panes have a location of their own, and their path is a cwd
+        record["location"] = node["name"] if node["kind"] == "pane" else None
+        record["cwd"] = record.pop("path", None)
+        writer.writerow(record)
+
+
+def prom_labels(**labels):
+    """Render a Prometheus label set, escaping values"""
+    escaped = (
+        str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        for v in labels.values()
+    )
+    return ",".join(f'{k}="{v}"' for k, v in zip(labels, escaped))
+
+
+def render_prom(candidates, rollups):
+    """Render per-session/per-pane gauges in the textfile exposition format"""
+    metrics = {
+        "tmux_advisor_session_memory_bytes": "Total RSS of all processes in a tmux or zellij session",
+        "tmux_advisor_session_reclaimable_bytes": "RSS of kill candidates in a tmux or zellij session",
+        "tmux_advisor_session_candidates": "Number of kill candidates in a tmux or zellij session",
+        "tmux_advisor_pane_memory_bytes": "Total RSS of a tmux or zellij pane's process subtree",
+        "tmux_advisor_pane_candidates": "Number of kill candidates in a tmux or zellij pane",
+        "tmux_advisor_candidates": "Number of kill candidates across all panes",
+        "tmux_advisor_orphan_candidates": "Number of kill candidates not attributed to a pane",
+    }
+    mb = 1024 * 1024
+    samples = defaultdict(list)
+    for session in rollups:
+        labels = prom_labels(session=session["name"])
+        samples["tmux_advisor_session_memory_bytes"].append(
+            (labels, int(session["rss_mb"] * mb))
+        )
+        samples["tmux_advisor_session_reclaimable_bytes"].append(
+            (labels, int(session["reclaim_mb"] * mb))
+        )
+        samples["tmux_advisor_session_candidates"].append(
+            (labels, len(session["candidates"]))
+        )
+        for node in session["children"]:
+            for pane in node["children"] if node["kind"] == "window" else [node]:
+                window = {"window": node["name"]} if node["kind"] == "window" else {}
+                labels = prom_labels(
+                    session=session["name"], **window, pane=pane["name"]
+                )
+                samples["tmux_advisor_pane_memory_bytes"].append(
+                    (labels, int(pane["rss_mb"] * mb))
+                )
+                samples["tmux_advisor_pane_candidates"].append(
+                    (labels, len(pane["candidates"]))
+                )
+    samples["tmux_advisor_candidates"].append(("", len(candidates)))
+    samples["tmux_advisor_orphan_candidates"].append(
+        ("", sum(1 for c in candidates if not c["pane_location"]))
+    )
+
+    lines = []
+    for name, help_text in metrics.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} gauge")
+        for labels, value in samples[name]:
+            lines.append(f"{name}{{{labels}}} {value}" if labels else f"{name} {value}")
+    return "\n".join(lines) + "\n"
+
+
+def write_prom_textfile(path, content):
+    """Atomically replace a node_exporter textfile, skipping no-op rewrites"""
+    try:
+        with open(path) as f:
+            if f.read() == content:
+                os.utime(path)
+                return
+    except OSError:
+        pass
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".tmux_advisor.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(content)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def subtree_pids(tree, roots):
+    """All pids in the subtrees under `roots`, roots included"""
+    seen, stack = set(), list(roots)
+    while stack:
+        pid = stack.pop()
+        if pid in seen or pid not in tree["by_pid"]:
+            continue
+        seen.add(pid)
+        stack.extend(tree["children"].get(pid, ()))
+    return seen
+
+
+def own_ancestors(tree):
+    """The advisor and every process above it, which it must never touch"""
+    protected, pid = set(), os.getpid()
+    while pid in tree["by_pid"] and pid not in protected:
+        protected.add(pid)
+        pid = tree["by_pid"][pid]["ppid"]
+    return protected
+
+
+def reclaim_entries(panes, tree, candidates, rollups):
+    """List everything that can be reclaimed: rollup nodes, then candidates"""
+    pane_pids = defaultdict(list)
+    for pid, pane in panes.items():
+        pane_pids[pane["location"]].append(pid)
+
+    entries = []
+    for node in iter_rollups(rollups):
+        leaves = [n for n in iter_rollups([node]) if n["kind"] == "pane"]
+        roots = [pid for leaf in leaves for pid in pane_pids[leaf["name"]]]
+        entries.append(
+            {
+                "kind": node["kind"],
+                "name": node["name"],
+                "id": node["id"],
+                "roots": roots,
+                "mux": node["mux"],
+                "estimate_mb": node["rss_mb"],
+                "cwd": node.get("path"),
+                "label": f"{node['kind']:<9} {node['name']:<24} {node['rss_mb']:8.1f} MB"
+                f"  ~{node['reclaim_mb']:.1f} MB reclaimable, {node['procs']} procs",
+            }
+        )
+    for c in candidates:
+        entries.append(
+            {
+                "kind": "process",
+                "name": str(c["pid"]),
+                "roots": [c["pid"]],
+                "estimate_mb": tree["subtree_rss"].get(c["pid"], c["rss_mb"]),
+                "cwd": c["cwd"],
+                "label": f"{'process':<9} {c['pid']:<24} "
+                f"{tree['subtree_rss'].get(c['pid'], c['rss_mb']):8.1f} MB"
+                f"  {c['display_location']}  {c['command'][:50]}",
+            }
+        )
+    return entries
+
+
+def render_preview(entry, tree):
+    """Describe an entry's process subtree for the fzf preview pane"""
+    lines = [f"{entry['kind']} {entry['name']}"]
+    if entry["cwd"]:
+        lines.append(f"cwd: {entry['cwd']}")
+    lines.append(f"subtree: {entry['estimate_mb']:.1f} MB\n")
+
+    def walk(pid, indent):
+        p = tree["by_pid"][pid]
+        lines.append(
+            f"{indent}{pid:>7} {tree['subtree_rss'][pid]:8.1f}MB  {p['command'][:80]}"
+        )
+        for child in sorted(tree["children"].get(pid, ())):
+            walk(child, indent + "  ")
+
+    for root in entry["roots"]:
+        if root in tree["by_pid"]:
+            walk(root, "")
+    return "\n".join(lines) + "\n"
+
+
+def select_with_fzf(entries, tree):
+    """Let the user multi-select entries in fzf, previewing each subtree"""
+    if not shutil.which("fzf"):
+        sys.exit("fzf not found; use --kill TARGET to select without it")
+    with tempfile.TemporaryDirectory(prefix="tmux_advisor.") as previews:
+        lines = []
+        for i, entry in enumerate(entries):
+            with open(os.path.join(previews, str(i)), "w") as f:
+                f.write(render_preview(entry, tree))
+            lines.append(f"{i}\t{entry['label']}")
+        result = subprocess.run(
+            [
+                "fzf",
+                "--multi",
+                "--delimiter",
+                "\t",
+                "--with-nth",
+                "2..",
+                "--header",
+                "TAB to select, ENTER to reclaim",
+                "--preview",
+                f"cat {previews}/{{1}}",
+            ],
+            input="\n".join(lines),
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+    return [entries[int(line.split("\t", 1)[0])] for line in result.stdout.splitlines()]
+
+
+def match_entries(entries, targets):
+    """Pick entries named on the command line by pid or tmux location"""
+    by_name = {entry["name"]: entry for entry in entries}
+    selected = []
+    for target in targets:
+        if target not in by_name:
+            sys.exit(f"No reclaimable session, window, pane or candidate: {target}")
+        selected.append(by_name[target])
+    return selected
+
+
+def is_alive(pid):
+    """Whether a pid is still running (zombies count as gone)"""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            return f.read().rsplit(")", 1)[1].split()[0] != "Z"
+    except (OSError, IndexError):
+        return True
+
+
+def terminate(pids, grace=5.0):
+    """SIGTERM every pid, then SIGKILL whatever outlives the grace period"""
+    for sig in (signal.SIGTERM, signal.SIGKILL):
+        for pid in pids:
+            try:
+                os.kill(pid, sig)
+            except (ProcessLookupError, PermissionError):
+                pass
+        deadline = time.monotonic() + (grace if sig == signal.SIGTERM else 1.0)
+        while time.monotonic() < deadline:
+            pids = [pid for pid in pids if is_alive(pid)]
+            if not pids:
+                return []
+            time.sleep(0.1)
+    return [pid for pid in pids if is_alive(pid)]
+
+
+def kill_tmux_targets(entries, socket=None):
+    """Close the tmux panes, windows and sessions behind the selected entries.
+
+    Targets are given by id: names like `t:1` match by prefix and shift as
+    windows are renumbered, so they could hit something that wasn't selected.
+    """
+    commands = {"pane": "kill-pane", "window": "kill-window", "session": "kill-session"}
+    for entry in entries:
+        # zellij panes close by themselves once their processes are gone
+        if entry["kind"] in commands and entry.get("mux") == "tmux" and entry["id"]:
+            subprocess.run(
+                tmux_command(commands[entry["kind"]], "-t", entry["id"], socket=socket),
+                capture_output=True,
+                timeout=5,
+            )
+
+
+def available_memory_mb():
+    """System-wide available memory, or None if it can't be read"""
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) / 1024.0
+    except OSError:
+        pass
+    try:
+        result = subprocess.run(["vm_stat"], capture_output=True, text=True, timeout=5)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    # macOS has no MemAvailable; free, inactive and speculative pages are the
+    # closest equivalent of what can be handed out without swapping
+    match = re.search(r"page size of (\d+) bytes", result.stdout)
+    if not match:
+        return None
+    pages = 0
+    for line in result.stdout.splitlines():
+        name, _, value = line.partition(":")
+        if name in ("Pages free", "Pages inactive", "Pages speculative"):
+            pages += int(value.strip().rstrip("."))
+    return pages * int(match.group(1)) / (1024.0 * 1024.0)
+
+
+def reclaim(entries, tree, grace=5.0, kill_tmux=False, socket=None, settle=1.0):
+    """Kill the selected subtrees and measure the memory actually freed.
+
+    The process table is re-read right before signalling so only pids that
+    still run the command we showed are touched. RSS counts shared pages
+    once per process, so the snapshot estimate overstates savings; the
+    system's available memory is sampled before and after (once the kernel
+    has had `settle` seconds to reclaim) to show what really came back.
+    """
+    roots = [pid for entry in entries for pid in entry["roots"]]
+    protected = own_ancestors(tree)
+    planned = subtree_pids(tree, roots) - protected
+    estimate = sum(tree["by_pid"][pid]["rss_mb"] for pid in planned)
+
+    before = {p["pid"]: p for p in parse_ps(run_ps())}
+    targets = {
+        pid: before[pid]
+        for pid in planned
+        if pid in before and before[pid]["command"] == tree["by_pid"][pid]["command"]
+    }
+
+    available_before = available_memory_mb()
+    if kill_tmux:
+        # Close the tmux targets first so no pane exits (and shifts the
+        # layout) while its siblings are still being signalled
+        kill_tmux_targets(
+            [e for e in entries if not subtree_pids(tree, e["roots"]) & protected],
+            socket,
+        )
+    survivors = terminate(list(targets), grace)
+
+    time.sleep(settle)
+    available_after = available_memory_mb()
+    after = {p["pid"]: p for p in parse_ps(run_ps())}
+    exited = sum(
+        p["rss_mb"] - after[pid]["rss_mb"]
+        if pid in after and after[pid]["command"] == p["command"]
+        else p["rss_mb"]
+        for pid, p in targets.items()
+    )
+    return {
+        "targets": len(targets),
+        "skipped": len(planned) - len(targets),
+        "survivors": survivors,
+        "estimate_mb": estimate,
+        "exited_rss_mb": exited,
+        "available_delta_mb": (
+            available_after - available_before
+            if available_before is not None and available_after is not None
+            else None
+        ),
+    }
+
+
+def print_reclaim(result):
+    """Print how much of the estimate a reclaim actually freed"""
+    print(
+        f"\n🧹 Signalled {result['targets']} processes"
+        f" ({result['skipped']} already gone or reused)"
+    )
+    print(f"  Estimated (snapshot RSS):    {result['estimate_mb']:8.1f} MB")
+    print(f"  RSS of exited processes:     {result['exited_rss_mb']:8.1f} MB")
+    if result["available_delta_mb"] is not None:
+        print(f"  System available memory:     {result['available_delta_mb']:+8.1f} MB")
+    else:
+        print("  System available memory:     unknown")
+    if result["survivors"]:
+        print(f"  ⚠️  Still running: {' '.join(map(str, result['survivors']))}")
+
+
+def state_path(socket=None):
+    """Where hibernation state for a tmux server is persisted"""
+    base = os.environ.get("XDG_STATE_HOME") or os.path.expanduser("~/.local/state")
+    return os.path.join(base, "tmux-advisor", f"frozen-{socket or 'default'}.json")
+
+
+def load_state(path):
+    """Load the frozen panes recorded by a previous run"""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def save_state(path, state):
+    """Atomically persist frozen panes so a crash can be recovered from"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    with os.fdopen(fd, "w") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp, path)
+
+
+def process_cgroup(pid):
+    """The cgroup v2 path a process belongs to, relative to the hierarchy root"""
+    try:
+        with open(f"/proc/{pid}/cgroup") as f:
+            for line in f:
+                if line.startswith("0::"):
+                    return line[3:].strip()
+    except OSError:
+        pass
+    return None
+
+
+def find_cgroup_root():
+    """A writable cgroup v2 directory to create frozen groups under, if any.
+
+    Only the user's own systemd-delegated subtree (user@UID.service) is
+    used, since processes can only be moved between cgroups we own.
+    """
+    if not os.path.exists("/sys/fs/cgroup/cgroup.controllers"):
+        return None
+    own = process_cgroup(os.getpid()) or ""
+    parts = own.strip("/").split("/")
+    for i, part in enumerate(parts):
+        if part.startswith("user@") and part.endswith(".service"):
+            root = os.path.join("/sys/fs/cgroup", *parts[: i + 1], "tmux-hibernate")
+            try:
+                os.makedirs(root, exist_ok=True)
+            except OSError:
+                return None
+            return root if os.access(root, os.W_OK) else None
+    return None
+
+
+def write_cgroup_file(path, value):
+    """Write a single value to a cgroup interface file"""
+    with open(path, "w") as f:
+        f.write(value)
+
+
+def freeze_cgroup(group, pids, origins):
+    """Move pids into their own cgroup and freeze it, recording origins"""
+    os.makedirs(group, exist_ok=True)
+    for pid in pids:
+        origin = process_cgroup(pid)
+        try:
+            write_cgroup_file(os.path.join(group, "cgroup.procs"), str(pid))
+        except ProcessLookupError:
+            continue
+        origins[str(pid)] = origin
+    write_cgroup_file(os.path.join(group, "cgroup.freeze"), "1")
+
+
+def thaw_cgroup(group, origins):
+    """Unfreeze a group and put its processes back where they came from"""
+    try:
+        write_cgroup_file(os.path.join(group, "cgroup.freeze"), "0")
+    except OSError:
+        return
+    for pid, origin in origins.items():
+        try:
+            write_cgroup_file(
+                os.path.join("/sys/fs/cgroup", origin.lstrip("/"), "cgroup.procs"),
+                pid,
+            )
+        except (OSError, AttributeError):
+            pass
+    try:
+        os.rmdir(group)
+    except OSError:
+        pass
+
+
+def signal_all(pids, sig):
+    """Send a signal to every pid that still exists"""
+    for pid in pids:
+        try:
+            os.kill(int(pid), sig)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+
+def get_process_groups(pids):
+    """Map pids to their (process group, tty foreground process group)"""
+    groups = {}
+    if not pids:
+        return groups
+    if os.path.isdir("/proc/self"):
+        for pid in pids:
+            try:
+                with open(f"/proc/{pid}/stat") as f:
+                    fields = f.read().rsplit(")", 1)[1].split()
+            except (OSError, IndexError):
+                continue
+            groups[pid] = (int(fields[2]), int(fields[5]))
+        return groups
+    try:
+        result = subprocess.run(
+            ["ps", "-o", "pid=,pgid=,tpgid=", "-p", ",".join(map(str, pids))],
+            capture_output=True,
+            text=True,
+            timeout=5,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return groups
+    for line in result.stdout.splitlines():
+        try:
+            pid, pgid, tpgid = map(int, line.split())
+        except ValueError:
+            continue
+        groups[pid] = (pgid, tpgid)
+    return groups
+
+
+def signal_freezable(pids, pane_pid):
+    """The pids SIGSTOP can hold without breaking the pane.
+
+    tmux resumes a pane's own process (and its process group) whenever it
+    stops. A job-control shell treats a stopped foreground job as ^Z, takes
+    the terminal back and leaves the job stopped in the background even
+    after SIGCONT. So only processes outside the tty's foreground process
+    group, other than the pane's own process, are stopped.
+    """
+    groups = get_process_groups([pid for pid in pids if pid != pane_pid])
+    return {pid for pid, (pgid, tpgid) in groups.items() if pgid != tpgid}
+
+
+def freeze_pane(entry, pane_pid):
+    """Freeze the processes recorded in a state entry.
+
+    Uses the cgroup v2 freezer when the entry names a group, falling back
+    to SIGSTOP on whatever signal_freezable allows.
+    """
+    if entry["method"] == "cgroup":
+        try:
+            freeze_cgroup(entry["cgroup"], entry["pids"], entry["origins"])
+            return
+        except OSError:
+            thaw_cgroup(entry["cgroup"], entry["origins"])
+            entry["method"] = "signal"
+            entry["pids"] = sorted(signal_freezable(entry["pids"], pane_pid))
+    signal_all(entry["pids"], signal.SIGSTOP)
+
+
+def thaw_pane(entry):
+    """Undo freeze_pane"""
+    if entry["method"] == "cgroup":
+        thaw_cgroup(entry["cgroup"], entry.get("origins", {}))
+    # SIGCONT is harmless on running processes, so send it either way in
+    # case something else stopped them while they sat in the frozen group
+    signal_all(entry["pids"], signal.SIGCONT)
+
+
+def thaw_all(path):
+    """Thaw every pane recorded in a state file and clear it"""
+    state = load_state(path)
+    for entry in state.values():
+        thaw_pane(entry)
+        print(f"🔥 Thawed {entry['location']} ({len(entry['pids'])} procs)")
+    if state:
+        save_state(path, {})
+    return len(state)
+
+
+def hibernate_tick(state, path, threshold_hours, socket=None, cgroup_root=None):
+    """One policy pass: thaw panes that woke up, freeze panes gone idle.
+
+    The state file is written before processes are stopped, so a crash at
+    any point leaves a record that the next run (or --thaw-all) thaws.
+    """
+    panes = parse_tmux_panes(list_tmux_panes(socket))
+    by_id = {pane.get("id"): (pid, pane) for pid, pane in panes.items()}
+    now = time.time()
+
+    for pane_id, entry in list(state.items()):
+        _, pane = by_id.get(pane_id, (None, None))
+        if pane and not pane["focused"] and pane["activity"] <= entry["activity"]:
+            continue
+        thaw_pane(entry)
+        del state[pane_id]
+        save_state(path, state)
+        print(f"🔥 Thawed {entry['location']} ({len(entry['pids'])} procs)")
+
+    idle = [
+        (pid, pane)
+        for pid, pane in panes.items()
+        if "id" in pane
+        and pane["id"] not in state
+        and not pane["focused"]
+        and pane["activity"]
+        and (now - pane["activity"]) / 3600 >= threshold_hours
+    ]
+    if not idle:
+        return
+
+    processes = parse_ps(run_ps())
+    tree = build_tree(processes, panes)
+    protected = own_ancestors(tree) | tree["server_pids"]
+    for pane_pid, pane in idle:
+        if pane_pid in protected:
+            continue
+        pids = subtree_pids(tree, [pane_pid]) - protected
+        if not cgroup_root:
+            pids = signal_freezable(pids, pane_pid)
+        if not pids:
+            continue
+        entry = {
+            "location": pane["location"],
+            "pids": sorted(pids),
+            "method": "cgroup" if cgroup_root else "signal",
+            "frozen_at": int(now),
+            "activity": pane["activity"],
+        }
+        if cgroup_root:
+            # Pane ids are only unique per server, so the socket is part of the name
+            group = f"{socket or 'default'}-{pane['id'].replace('%', 'pane-')}"
+            entry["cgroup"] = os.path.join(cgroup_root, group)
+            entry["origins"] = {}
+        state[pane["id"]] = entry
+        save_state(path, state)
+        freeze_pane(entry, pane_pid)
+        save_state(path, state)
+        mb = tree["subtree_rss"].get(pane_pid, 0)
+        print(
+            f"❄️  Froze {pane['location']} ({len(pids)} procs, {mb:.1f} MB)"
+            f" via {entry['method']}"
+        )
+
+
+def hibernate(threshold_hours, interval=15.0, once=False, socket=None, freezer="auto"):
+    """Keep idle panes frozen until they are focused or produce output"""
+    path = state_path(socket)
+    if once:
+        # Timer-driven runs pick up where the previous pass left off
+        state = load_state(path)
+    else:
+        # Anything left over from a crashed daemon is thawed before starting
+        thaw_all(path)
+        state = {}
+    cgroup_root = find_cgroup_root() if freezer != "signal" else None
+    if freezer == "cgroup" and not cgroup_root:
+        sys.exit("No writable cgroup v2 hierarchy found; use --freezer signal")
+
+    stop = []
+    for sig in (signal.SIGTERM, signal.SIGHUP):
+        signal.signal(sig, lambda *_: stop.append(True))
+    try:
+        while not stop:
+            hibernate_tick(state, path, threshold_hours, socket, cgroup_root)
+            if once:
+                return
+            deadline = time.monotonic() + interval
+            while not stop and time.monotonic() < deadline:
+                time.sleep(0.5)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        # A daemon that dies on any error must not leave panes frozen behind it
+        if not once:
+            thaw_all(path)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Find long-running tmux and zellij processes worth killing."
+    )
+    parser.add_argument(
+        "--format",
+        choices=["text", "json", "csv"],
+        help="output format (default: text, or none with --prom-textfile)",
+    )
+    parser.add_argument(
+        "--prom-textfile",
+        metavar="PATH",
+        help="write gauges for node_exporter's textfile collector to PATH",
+    )
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument(
+        "--record",
+        metavar="DIR",
+        help="save the raw tmux, zellij, ps and cwd data from this run to DIR",
+    )
+    source.add_argument(
+        "--replay",
+        metavar="DIR",
+        help="analyze a snapshot saved with --record instead of the live system",
+    )
+    parser.add_argument(
+        "--socket",
+        metavar="NAME",
+        help="talk to the tmux server on socket NAME (tmux -L)",
+    )
+    parser.add_argument(
+        "-i",
+        "--interactive",
+        action="store_true",
+        help="pick sessions, windows, panes or processes to kill in fzf",
+    )
+    parser.add_argument(
+        "--kill",
+        metavar="TARGET",
+        action="append",
+        help="kill a session, window, pane (by location) or process (by pid)",
+    )
+    parser.add_argument(
+        "--grace",
+        type=float,
+        default=5.0,
+        help="seconds between SIGTERM and SIGKILL (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--kill-tmux",
+        action="store_true",
+        help="also close the selected tmux panes, windows and sessions",
+    )
+    parser.add_argument(
+        "-y", "--yes", action="store_true", help="don't ask before killing"
+    )
+    parser.add_argument(
+        "--hibernate",
+        metavar="MINUTES",
+        type=float,
+        help="freeze panes idle for MINUTES until they are focused again",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=15.0,
+        help="seconds between hibernation checks (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--once",
+        action="store_true",
+        help="run a single hibernation pass and leave frozen panes frozen",
+    )
+    parser.add_argument(
+        "--freezer",
+        choices=["auto", "cgroup", "signal"],
+        default="auto",
+        help="how to freeze panes (default: cgroup v2 if writable, else SIGSTOP)",
+    )
+    parser.add_argument(
+        "--thaw-all",
+        action="store_true",
+        help="thaw every pane frozen by --hibernate and exit",
+    )
+    args = parser.parse_args(argv)
+    if (args.interactive or args.kill) and args.replay:
+        parser.error("cannot kill processes from a replayed snapshot")
+    if args.format is None and not args.prom_textfile:
+        args.format = "text"
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.thaw_all:
+        thaw_all(state_path(args.socket))
+        return
+    if args.hibernate is not None:
+        hibernate(
+            args.hibernate / 60, args.interval, args.once, args.socket, args.freezer
+        )
+        return
+    text = args.format == "text"
+    # Metrics-only runs never show a cwd, so skip the lookups entirely
+    with_cwds = bool(args.format or args.record)
+
+    if text:
+        print("🔍 Analyzing tmux and zellij processes...\n")
+
+    if args.replay:
+        snapshot = load_snapshot(args.replay)
+        cwd_lookup = replay_cwd_lookup(snapshot)
+    else:
+        snapshot = capture_snapshot(args.socket, with_cwds)
+        cwd_lookup = get_process_cwds
+        if args.record:
+            cwd_lookup = recording_cwd_lookup(snapshot, cwd_lookup)
+
+    processes = parse_ps(snapshot["ps"])
+    panes = get_panes(snapshot, processes)
+    if text:
+        zellij = sum(1 for pane in panes.values() if pane["mux"] == "zellij")
+        print(f"Found {len(panes) - zellij} tmux panes, {zellij} zellij panes")
+        print(f"Found {len(processes)} total processes\n")
+
+    tree = build_tree(processes, panes)
+    candidates = score_candidates(
+        processes, panes, tree, cwd_lookup=cwd_lookup if with_cwds else None
+    )
+    rollups = build_rollups(panes, tree, candidates)
+
+    if args.record:
+        save_snapshot(args.record, snapshot)
+
+    if args.interactive or args.kill:
+        entries = reclaim_entries(panes, tree, candidates, rollups)
+        if args.kill:
+            selected = match_entries(entries, args.kill)
+        else:
+            selected = select_with_fzf(entries, tree)
+        if not selected:
+            return
+        for entry in selected:
+            print(f"  {entry['label']}")
+        if not args.yes and input("\nKill these? [y/N] ").strip().lower() != "y":
+            return
+        print_reclaim(reclaim(selected, tree, args.grace, args.kill_tmux, args.socket))
+    elif text:
+        print_report(candidates, rollups)
+    elif args.format == "json":
+        write_json(candidates, rollups)
+    elif args.format == "csv":
+        write_csv(candidates, rollups)
+
+    if args.prom_textfile:
+        write_prom_textfile(args.prom_textfile, render_prom(candidates, rollups))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Benchmark for tmux_cleanup_advisor.py.
+Times each stage of the advisor (parse, tree build, scoring, rollups,
+rendering) on recorded or synthetic snapshots and prints JSON results.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import tmux_cleanup_advisor as advisor
+
+COMMANDS = [
+    ("nvim --embed", 80, 400),
+    ("claude", 150, 600),
+    ("python3 -m http.server", 20, 120),
+    ("node node_modules/.bin/vite", 60, 300),
+    ("pyright-langserver --stdio", 100, 500),
+    ("cargo watch -x check", 10, 60),
+    ("less README.md", 1, 8),
+]
+
+
+def format_elapsed(hours):
+    """Format hours the way `ps -o etime` does"""
+    seconds = int(hours * 3600)
+    days, seconds = divmod(seconds, 86400)
+    h, seconds = divmod(seconds, 3600)
+    m, s = divmod(seconds, 60)
+    if days:
+        return f"{days}-{h:02}:{m:02}:{s:02}"
+    if h:
+        return f"{h:02}:{m:02}:{s:02}"
+    return f"{m:02}:{s:02}"
+
+
+def generate_snapshot(
+    procs=1000, sessions=4, windows=4, panes=2, depth=4, fanout=3, orphans=0.05, seed=0
+):
+    """Build a synthetic snapshot in the advisor's raw record format.
+
+    Every pane gets a login shell; the remaining processes are hung off random
+    pane subtrees, at most `depth` levels below the shell and `fanout`
+    children per process. A fraction are parented directly to the tmux
+    server so they show up as orphans.
+    """
+    rng = random.Random(seed)
+    rows = [(1, 0, 12_000, 720.0, "/sbin/launchd"), (100, 1, 24_000, 720.0, "tmux")]
+    tmux_lines, cwds = [], {}
+    slots = []  # (pid, depth) of processes that can still take children
+    child_count = {}
+    next_pid = 1000
+
+    for s in range(sessions):
+        for w in range(windows):
+            for p in range(panes):
+                pid, next_pid = next_pid, next_pid + 1
+                path = f"/Users/me/Projects/proj{s}/mod{w}"
+                hours = rng.uniform(0.1, 240)
+                rows.append((pid, 100, rng.randint(2_000, 9_000), hours, "-zsh"))
+                active = "1" if p == 0 else "0"
+                pane_id = f"%{len(tmux_lines)}"
+                window_id = f"@{s * windows + w}"
+                tmux_lines.append(
+                    f"sess{s}:{w}.{p}|{pid}|{active}|{pane_id}|1|0|0"
+                    f"|{window_id}|${s}|{path}"
+                )
+                cwds[pid] = path
+                slots.append((pid, 0, hours, path))
+                child_count[pid] = 0
+
+    while len(rows) < procs:
+        pid, next_pid = next_pid, next_pid + 1
+        command, low, high = rng.choice(COMMANDS)
+        rss_kb = int(rng.uniform(low, high) * 1024)
+        if rng.random() < orphans or not slots:
+            hours = rng.uniform(0, 240)
+            rows.append((pid, 100, rss_kb, hours, command))
+            cwds[pid] = f"/Users/me/Projects/orphan{rng.randint(0, 9)}/src/lib/x"
+            continue
+        i = rng.randrange(len(slots))
+        parent, level, parent_hours, path = slots[i]
+        hours = rng.uniform(0, parent_hours)
+        rows.append((pid, parent, rss_kb, hours, command))
+        cwds[pid] = path
+        child_count[parent] += 1
+        if child_count[parent] >= fanout:
+            slots[i] = slots[-1]
+            slots.pop()
+        if level + 1 < depth:
+            slots.append((pid, level + 1, hours, path))
+            child_count[pid] = 0
+
+    ps_lines = ["  PID  PPID   RSS     ELAPSED COMMAND"]
+    for pid, ppid, rss_kb, hours, command in rows:
+        ps_lines.append(
+            f"{pid:5} {ppid:5} {rss_kb:5} {format_elapsed(hours):>11} {command}"
+        )
+    return {
+        "tmux": "\n".join(tmux_lines) + "\n",
+        "ps": "\n".join(ps_lines) + "\n",
+        "cwds": cwds,
+        "zellij": {},
+    }
+
+
+def time_stages(snapshot):
+    """Run the advisor pipeline once, timing each stage"""
+    timings = {}
+
+    start = time.perf_counter()
+    processes = advisor.parse_ps(snapshot["ps"])
+    panes = advisor.get_panes(snapshot, processes)
+    timings["parse"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    tree = advisor.build_tree(processes, panes)
+    timings["tree"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    candidates = advisor.score_candidates(
+        processes, panes, tree, cwd_lookup=advisor.replay_cwd_lookup(snapshot)
+    )
+    timings["score"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    rollups = advisor.build_rollups(panes, tree, candidates)
+    timings["rollup"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        advisor.print_report(candidates, rollups)
+    timings["render"] = time.perf_counter() - start
+
+    return timings, {
+        "panes": len(panes),
+        "processes": len(processes),
+        "candidates": len(candidates),
+    }
+
+
+def benchmark(snapshot, repeat):
+    """Time every stage `repeat` times and summarize in milliseconds"""
+    runs = []
+    for _ in range(repeat):
+        timings, counts = time_stages(snapshot)
+        runs.append(timings)
+    stages = {}
+    for stage in runs[0]:
+        samples = [run[stage] * 1000 for run in runs]
+        stages[stage] = {
+            "min_ms": round(min(samples), 3),
+            "median_ms": round(statistics.median(samples), 3),
+            "max_ms": round(max(samples), 3),
+        }
+    total = [sum(run.values()) * 1000 for run in runs]
+    return {
+        **counts,
+        "stages": stages,
+        "total_median_ms": round(statistics.median(total), 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument(
+        "--sizes",
+        default="1000,10000,50000",
+        help="comma-separated synthetic process counts (default: %(default)s)",
+    )
+    parser.add_argument("--sessions", type=int, default=4)
+    parser.add_argument("--windows", type=int, default=4, help="windows per session")
+    parser.add_argument("--panes", type=int, default=2, help="panes per window")
+    parser.add_argument("--depth", type=int, default=4, help="max depth below a pane")
+    parser.add_argument(
+        "--fanout", type=int, default=3, help="max children per process"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--replay",
+        metavar="DIR",
+        action="append",
+        help="benchmark a snapshot recorded with --record (repeatable)",
+    )
+    parser.add_argument(
+        "--generate",
+        metavar="DIR",
+        help="write one synthetic snapshot (first size) to DIR and exit",
+    )
+    parser.add_argument("-o", "--output", help="write JSON results here, not stdout")
+    args = parser.parse_args()
+
+    shape = {
+        "sessions": args.sessions,
+        "windows": args.windows,
+        "panes": args.panes,
+        "depth": args.depth,
+        "fanout": args.fanout,
+        "seed": args.seed,
+    }
+    sizes = [int(size) for size in args.sizes.split(",")]
+
+    if args.generate:
+        advisor.save_snapshot(args.generate, generate_snapshot(sizes[0], **shape))
+        return
+
+    results = []
+    for directory in args.replay or []:
+        results.append(
+            {
+                "source": directory,
+                **benchmark(advisor.load_snapshot(directory), args.repeat),
+            }
+        )
+    if not args.replay:
+        for size in sizes:
+            snapshot = generate_snapshot(size, **shape)
+            results.append({"source": "synthetic", **benchmark(snapshot, args.repeat)})
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "shape": shape,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
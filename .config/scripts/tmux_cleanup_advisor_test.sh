@@ -0,0 +1,248 @@
+#!/bin/bash
+# Check the advisor against a replayed synthetic snapshot, then exercise its
+# reclaim and hibernation workflows against sleeper processes in a throwaway
+# tmux server, leaving any real tmux sessions alone.
+set -euo pipefail
+
+RED='\033[0;31m'
+GREEN='\033[0;32m'
+YELLOW='\033[1;33m'
+NC='\033[0m'
+
+ADVISOR="$(cd "$(dirname "$0")" && pwd)/tmux_cleanup_advisor.py"
+BENCH="$(cd "$(dirname "$0")" && pwd)/tmux_cleanup_advisor_bench.py"
+SOCKET="advisor-test-$$"
+FAILED=0
+
+pass() {
+  echo -e "${GREEN}✓${NC} $1"
+}
+
+fail() {
+  echo -e "${RED}✗${NC} $1"
+  FAILED=1
+}
+
+# Replay regression: a fixed-seed synthetic snapshot must keep scoring and
+# rolling up to the same totals
+FIXTURE=$(mktemp -d)
+trap 'rm -rf "$FIXTURE"' EXIT
+"$BENCH" --generate "$FIXTURE" --sizes 500 --seed 7
+summary=$("$ADVISOR" --replay "$FIXTURE" --format json | python3 -c '
+import json, sys
+report = json.load(sys.stdin)
+candidates = report["candidates"]
+print(len(candidates), round(sum(c["rss_mb"] for c in candidates), 2))
+print(" ".join("%s=%s" % (r["name"], r["rss_mb"]) for r in report["rollups"]))
+')
+
+if [[ "$summary" == "433 77517.85"$'\n'"sess3=20633.87 sess1=20170.02 sess0=18815.19 sess2=17436.76" ]]; then
+  pass "replayed snapshot keeps its candidate and rollup totals"
+else
+  fail "replayed snapshot keeps its candidate and rollup totals (got: ${summary//$'\n'/ | })"
+fi
+
+# Zellij mapping: a recorded snapshot with a zellij server next to a tmux one
+mkdir "$FIXTURE/zellij"
+printf 'work:0.0|500|1|%%0|1|1|0|@0|$0|/tmp/a|b\n' >"$FIXTURE/zellij/tmux.txt"
+cat >"$FIXTURE/zellij/ps.txt" <<'EOF'
+  PID  PPID    RSS     ELAPSED COMMAND
+    1     0   1024 10-00:00:00 /sbin/launchd
+  400     1  30720 10-00:00:00 tmux new -s work
+  500   400   5120 10-00:00:00 -zsh
+  501   500  92160  2-00:00:00 python3 app.py
+  600     1  40960 10-00:00:00 /opt/homebrew/bin/zellij --server /tmp/zellij-501/0.40.1/main
+  700   600   5120 10-00:00:00 /bin/zsh
+  701   700 307200  1-00:00:00 nvim --embed
+  710   600   5120 10-00:00:00 /bin/zsh
+  711   710 204800  1-00:00:00 claude
+  800     1   8192 10-00:00:00 zellij attach main
+EOF
+echo '{}' >"$FIXTURE/zellij/cwds.json"
+cat >"$FIXTURE/zellij/zellij.json" <<'EOF'
+{
+  "environ": {
+    "700": {"ZELLIJ_SESSION_NAME": "main", "ZELLIJ_PANE_ID": "0"},
+    "710": {"ZELLIJ_SESSION_NAME": "main", "ZELLIJ_PANE_ID": "3"}
+  },
+  "clients": {"main": "CLIENT_ID ZELLIJ_PANE_ID RUNNING_COMMAND\n1 terminal_3 claude\n"},
+  "cwds": {"700": "/Users/me/proj", "710": "/Users/me/other"}
+}
+EOF
+summary=$("$ADVISOR" --replay "$FIXTURE/zellij" --format json | python3 -c '
+import json, sys
+for session in json.load(sys.stdin)["rollups"]:
+    panes = " ".join(
+        "%s=%s%s" % (p["name"], p["rss_mb"], "*" if p["active"] else "")
+        for p in session["children"]
+        if p["kind"] == "pane"
+    )
+    print(session["mux"], session["name"], session["rss_mb"], panes)
+')
+
+if [[ "$summary" == "zellij zellij:main 510.0 zellij:main.0=305.0 zellij:main.3=205.0*"$'\n'"tmux work 95.0 " ]]; then
+  pass "zellij panes are mapped to sessions and ranked with tmux"
+else
+  fail "zellij panes are mapped to sessions and ranked with tmux (got: ${summary//$'\n'/ | })"
+fi
+
+if ! command -v tmux >/dev/null 2>&1; then
+  echo -e "${YELLOW}⊘${NC} tmux not installed (skipped)"
+  exit "$FAILED"
+fi
+
+t() {
+  tmux -L "$SOCKET" "$@"
+}
+
+cleanup() {
+  t kill-server 2>/dev/null || true
+  rm -rf "$FIXTURE"
+}
+trap cleanup EXIT
+
+pane_pid() {
+  t display-message -p -t "$1" '#{pane_pid}'
+}
+
+alive() {
+  local state
+  state=$(ps -o stat= -p "$1" 2>/dev/null) || return 1
+  [[ "$state" != Z* ]]
+}
+
+# t:0.0 holds ~50 MB, t:0.1 is a bystander, t:1 ignores SIGTERM
+t -f /dev/null new-session -d -s t -x 200 -y 50 \
+  "sh -c 'python3 -c \"x = bytearray(50_000_000); import time; time.sleep(600)\" & sleep 600 & wait'"
+t split-window -t t:0 "sleep 600"
+t new-window -t t:1 "sh -c \"trap '' TERM; sleep 600 & sleep 600\""
+sleep 1
+
+hog_shell=$(pane_pid t:0.0)
+hog=$(pgrep -P "$hog_shell" python3)
+bystander=$(pane_pid t:0.1)
+stubborn=$(pgrep -P "$(pane_pid t:1.0)" sleep | head -1)
+
+output=$("$ADVISOR" --socket "$SOCKET" --kill t:0.0 --yes --grace 1)
+exited=$(echo "$output" | awk '/RSS of exited processes:/ {print int($5)}')
+
+if ! alive "$hog" && ! alive "$hog_shell"; then
+  pass "pane subtree is terminated"
+else
+  fail "pane subtree is terminated"
+fi
+if alive "$bystander"; then
+  pass "other panes are left alone"
+else
+  fail "other panes are left alone"
+fi
+if [[ "${exited:-0}" -ge 40 ]]; then
+  pass "reports RSS of exited processes (${exited} MB)"
+else
+  fail "reports RSS of exited processes (got '${exited:-}')"
+fi
+if echo "$output" | grep -Eq 'System available memory: +[+-][0-9]'; then
+  pass "reports the change in system available memory"
+else
+  fail "reports the change in system available memory"
+fi
+
+"$ADVISOR" --socket "$SOCKET" --kill t:1 --kill-tmux --yes --grace 1 >/dev/null
+
+if ! alive "$stubborn"; then
+  pass "SIGTERM-ignoring process is escalated to SIGKILL"
+else
+  fail "SIGTERM-ignoring process is escalated to SIGKILL"
+fi
+if ! t list-windows -t t -F '#{window_index}' | grep -qx 1; then
+  pass "--kill-tmux closes the window"
+else
+  fail "--kill-tmux closes the window"
+fi
+
+if "$ADVISOR" --socket "$SOCKET" --kill nope:9 --yes >/dev/null 2>&1; then
+  fail "unknown targets are rejected"
+else
+  pass "unknown targets are rejected"
+fi
+
+# Hibernation: everything on a detached server counts as unfocused
+export XDG_STATE_HOME
+XDG_STATE_HOME=$(mktemp -d)
+trap 'cleanup; rm -rf "$XDG_STATE_HOME"' EXIT
+
+# An interactive shell with a background job and a foreground job: only the
+# background job may be stopped, or bash would take the terminal back and
+# leave the foreground job stopped
+t new-window -t t:2 "bash --norc --noprofile -i"
+sleep 0.5
+t send-keys -t t:2 "sleep 600 &" Enter
+t send-keys -t t:2 "cat" Enter
+sleep 1
+shell=$(pane_pid t:2.0)
+sleeper=$(pgrep -P "$shell" sleep)
+foreground=$(pgrep -P "$shell" cat)
+
+"$ADVISOR" --socket "$SOCKET" --hibernate 0 --once --freezer signal >/dev/null
+
+if [[ "$(ps -o stat= -p "$sleeper")" == T* ]]; then
+  pass "idle pane's background job is frozen"
+else
+  fail "idle pane's background job is frozen"
+fi
+if [[ "$(ps -o stat= -p "$foreground")" != T* ]]; then
+  pass "idle pane's foreground job is left running"
+else
+  fail "idle pane's foreground job is left running"
+fi
+if [[ -s "$XDG_STATE_HOME/tmux-advisor/frozen-$SOCKET.json" ]]; then
+  pass "frozen panes are persisted"
+else
+  fail "frozen panes are persisted"
+fi
+
+"$ADVISOR" --socket "$SOCKET" --thaw-all >/dev/null
+sleep 0.5
+
+if [[ "$(ps -o stat= -p "$sleeper")" != T* ]]; then
+  pass "--thaw-all resumes frozen panes"
+else
+  fail "--thaw-all resumes frozen panes"
+fi
+if [[ "$(ps -o stat= -p "$foreground")" == *+* ]]; then
+  pass "foreground job keeps the terminal after thawing"
+else
+  fail "foreground job keeps the terminal after thawing"
+fi
+
+# --kill-tmux goes by tmux id: once the selected processes exit, pane and
+# (with renumber-windows) window indexes shift, and a vanished session "r"
+# would prefix-match "rest"
+t new-session -d -s r "sleep 600"
+t set -t r renumber-windows on
+t split-window -t r:0 "sleep 600"
+t new-window -t r:1 "sleep 600"
+t new-window -t r:2 "sleep 600"
+t new-session -d -s rest "sleep 600"
+sleep 0.5
+sibling=$(pane_pid r:0.1)
+later=$(pane_pid r:2.0)
+
+"$ADVISOR" --socket "$SOCKET" --kill r:0.0 --kill-tmux --yes --grace 1 >/dev/null
+"$ADVISOR" --socket "$SOCKET" --kill r:1 --kill-tmux --yes --grace 1 >/dev/null
+
+if alive "$sibling" && alive "$later"; then
+  pass "--kill-tmux spares renumbered panes and windows"
+else
+  fail "--kill-tmux spares renumbered panes and windows"
+fi
+
+"$ADVISOR" --socket "$SOCKET" --kill r --kill-tmux --yes --grace 1 >/dev/null
+
+if ! t has-session -t =r 2>/dev/null && t has-session -t =rest 2>/dev/null; then
+  pass "--kill-tmux spares sessions sharing a name prefix"
+else
+  fail "--kill-tmux spares sessions sharing a name prefix"
+fi
+
+exit "$FAILED"